@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.contrib.gis.admin import GISModelAdmin
+from django.db.models import Prefetch
 
 from .models import Export, ExportRun
 
@@ -18,6 +19,7 @@ class ExportAdmin(GISModelAdmin):
     list_filter = ["source", "output_format", "is_public", "created_at"]
     search_fields = ["name", "description", "user__email"]
     readonly_fields = ["created_at", "updated_at"]
+    list_select_related = ["user"]
 
     fieldsets = (
         ("Basic Information", {"fields": ("name", "description", "user")}),
@@ -39,6 +41,18 @@ class ExportAdmin(GISModelAdmin):
         ),
     )
 
+    def get_queryset(self, request):
+        latest_runs = ExportRun.objects.only("id", "export_id", "status").order_by(
+            "-created_at"
+        )[:1]
+        return (
+            super()
+            .get_queryset(request)
+            .prefetch_related(
+                Prefetch("runs", queryset=latest_runs, to_attr="_latest_runs")
+            )
+        )
+
     def latest_run_status(self, obj):
         latest_run = obj.latest_run
         if latest_run:
@@ -60,6 +74,7 @@ class ExportRunAdmin(admin.ModelAdmin):
     ]
     list_filter = ["status", "export__source", "created_at"]
     search_fields = ["export__name", "export__user__email"]
+    list_select_related = ["export"]
     readonly_fields = [
         "task_id",
         "started_at",
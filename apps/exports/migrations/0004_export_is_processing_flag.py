@@ -0,0 +1,32 @@
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+
+
+def backfill_is_processing_flag(apps, schema_editor):
+    Export = apps.get_model("exports", "Export")
+    ExportRun = apps.get_model("exports", "ExportRun")
+    Export.objects.update(
+        is_processing_flag=Exists(
+            ExportRun.objects.filter(
+                export=OuterRef("pk"), status__in=["pending", "queued", "processing"]
+            )
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exports', '0003_exportrun_tiles_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='export',
+            name='is_processing_flag',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.RunPython(
+            backfill_is_processing_flag, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exports', '0004_export_is_processing_flag'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='export',
+            name='exports_exp_is_publ_175fd2_idx',
+        ),
+        migrations.AddIndex(
+            model_name='export',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['-created_at'], name='exports_export_public_idx'),
+        ),
+    ]
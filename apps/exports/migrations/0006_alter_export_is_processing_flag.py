@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exports', '0005_export_public_partial_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='export',
+            name='is_processing_flag',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+    ]
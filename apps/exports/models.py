@@ -1,10 +1,12 @@
+import posixpath
 import uuid
 
 from django.contrib.auth import get_user_model
 from django.contrib.gis.db import models as gis_models
 from django.contrib.postgres.fields import ArrayField
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Exists, OuterRef, Prefetch, Q, Value, When
 
 User = get_user_model()
 
@@ -31,6 +33,8 @@ EXPORT_STATUS_CHOICES = [
     ("failed", "Failed"),
 ]
 
+PROCESSING_STATUSES = ["pending", "queued", "processing"]
+
 SOURCE_CONFIG_SCHEMA = {
     "google": {
         "type": "object",
@@ -74,6 +78,61 @@ def validate_source_config(source, config):
     return True
 
 
+def _isoformat(value):
+    if value is None:
+        return None
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+class ExportQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        if user.is_authenticated:
+            return self.filter(Q(user=user) | Q(is_public=True))
+        return self.filter(is_public=True)
+
+    def with_run_summary(self):
+        """Load the owner and latest run for list rendering."""
+        latest_runs = ExportRun.objects.only(
+            "id",
+            "export_id",
+            "status",
+            "results",
+            "started_at",
+            "completed_at",
+            "created_at",
+        ).order_by("-created_at")[:1]
+        return (
+            self.select_related("user")
+            .prefetch_related(
+                Prefetch("runs", queryset=latest_runs, to_attr="_latest_runs")
+            )
+        )
+
+
+class ExportRunQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        if user.is_authenticated:
+            return self.filter(Q(export__user=user) | Q(export__is_public=True))
+        return self.filter(export__is_public=True)
+
+    def owned_by(self, user):
+        return self.select_related("export").filter(export__user=user)
+
+    def with_can_view(self, user):
+        """Annotate ``can_view`` so access is decided in the same query as the fetch."""
+        rules = [When(export__is_public=True, then=Value(True))]
+        if user.is_authenticated:
+            rules.append(When(export__user=user, then=Value(True)))
+        return self.annotate(
+            can_view=Case(
+                *rules, default=Value(False), output_field=models.BooleanField()
+            )
+        )
+
+
 class Export(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="exports")
@@ -91,17 +150,42 @@ class Export(models.Model):
     )
 
     is_public = models.BooleanField(default=False)
+    # True while any run is pending, queued or processing. Only maintained by
+    # ExportRun.save()/delete(): queryset update(), bulk_create() and queryset
+    # delete() on runs bypass it. Keep run status changes on save().
+    is_processing_flag = models.BooleanField(
+        default=False, db_index=True, editable=False
+    )
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ExportQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["user", "-created_at"]),
-            models.Index(fields=["is_public", "-created_at"]),
+            # Public rows are a small fraction; a partial index keeps the public
+            # listing (and the is_public branch of visible_to) on a tiny index.
+            models.Index(
+                fields=["-created_at"],
+                condition=Q(is_public=True),
+                name="exports_export_public_idx",
+            ),
         ]
 
+    def save(self, *args, **kwargs):
+        # The flag is owned by ExportRun; a full save of an instance loaded
+        # before a run changed status must not write the stale value back.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "is_processing_flag"
+            ]
+        super().save(*args, **kwargs)
+
     def clean(self):
         super().clean()
         # Validate each source if needed
@@ -116,11 +200,13 @@ class Export(models.Model):
 
     @property
     def latest_run(self):
+        if hasattr(self, "_latest_runs"):
+            return self._latest_runs[0] if self._latest_runs else None
         return self.runs.first()
 
     @property
     def is_processing(self):
-        return self.runs.filter(status__in=["pending", "queued", "processing"]).exists()
+        return self.is_processing_flag
 
 
 class ExportRun(models.Model):
@@ -145,6 +231,8 @@ class ExportRun(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ExportRunQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
@@ -153,6 +241,29 @@ class ExportRun(models.Model):
             models.Index(fields=["task_id"]),
         ]
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "status" not in update_fields:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._sync_export_processing_flag()
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            self._sync_export_processing_flag()
+        return result
+
+    def _sync_export_processing_flag(self):
+        Export.objects.filter(pk=self.export_id).update(
+            is_processing_flag=Exists(
+                ExportRun.objects.filter(
+                    export=OuterRef("pk"), status__in=PROCESSING_STATUSES
+                )
+            )
+        )
+
     def __str__(self):
         return f"{self.export.name} - Run {self.created_at.strftime('%Y-%m-%d %H:%M')}"
 
@@ -166,6 +277,12 @@ class ExportRun(models.Model):
     def building_count(self):
         return self.results.get("building_count", 0)
 
+    @property
+    def output_filename(self):
+        if self.output_file:
+            return posixpath.basename(self.output_file.name)
+        return None
+
     @property
     def file_size(self):
         if self.output_file:
@@ -174,3 +291,29 @@ class ExportRun(models.Model):
             except (OSError, ValueError):
                 pass
         return 0
+
+    def as_api_dict(self):
+        """Same payload as ExportRunSerializer, built without the serializer."""
+        completed = self.status == "completed"
+        duration = self.duration
+        return {
+            "id": str(self.id),
+            "export": str(self.export),
+            "status": self.status,
+            "results": self.results,
+            "started_at": _isoformat(self.started_at),
+            "completed_at": _isoformat(self.completed_at),
+            "error_message": self.error_message,
+            "task_id": self.task_id,
+            "created_at": _isoformat(self.created_at),
+            "updated_at": _isoformat(self.updated_at),
+            "duration": str(duration) if duration else None,
+            "building_count": self.building_count,
+            "file_size": self.file_size,
+            "download_url": f"/api/runs/{self.id}/download/"
+            if self.output_file and completed
+            else None,
+            "tiles_url": f"/api/runs/{self.id}/tiles/"
+            if self.tiles_file and completed
+            else None,
+        }
@@ -35,6 +35,19 @@ class ExportSerializer(GeoFeatureModelSerializer):
         ]
         read_only_fields = ["id", "user", "created_at", "updated_at"]
 
+    def validate_area_of_interest(self, value):
+        if isinstance(value, dict):
+            value = GEOSGeometry(str(value))
+        # validate-aoi skips full validity for small AOIs, so repair here before
+        # the geometry is stored and handed to the export task.
+        if not value.valid:
+            value = value.make_valid()
+            if value.geom_type != "Polygon":
+                raise serializers.ValidationError(
+                    "Area of interest must be a single valid polygon"
+                )
+        return value
+
     def create(self, validated_data):
         # Convert GeoJSON dict to GEOSGeometry if needed
         area_of_interest = validated_data.get("area_of_interest")
@@ -145,7 +158,8 @@ class CreateExportRunSerializer(serializers.ModelSerializer):
     class Meta:
         model = ExportRun
         fields = ["id", "export"]
-        read_only_fields = ["id"]
+        # The export comes from the URL and is passed to save() by the view.
+        read_only_fields = ["id", "export"]
 
     def create(self, validated_data):
         validated_data["status"] = "pending"
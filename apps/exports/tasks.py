@@ -5,6 +5,7 @@ import zipfile
 from pathlib import Path
 from typing import Any, Dict
 
+import pandas as pd
 from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.mail import send_mail
@@ -24,6 +25,10 @@ from .tiles import (
 
 logger = logging.getLogger(__name__)
 
+# Short tasks jump ahead of queued exports so they are not stuck behind
+# long-running extractions on a busy consumer.
+SHORT_TASK_PRIORITY = 10
+
 
 @task()
 def process_export(export_run_id: str) -> Dict[str, Any]:
@@ -48,6 +53,10 @@ def process_export(export_run_id: str) -> Dict[str, Any]:
         source_results = {}
         all_files = {}
         total_building_count = 0
+        # Sources without a GeoJSON output feed tiles straight from their
+        # GeoDataFrame; keep those frames instead of downloading them again.
+        tile_gdfs = {}
+        tiles_enabled = is_tippecanoe_available()
 
         for source in sources:
             logger.info("Processing source: %s", source)
@@ -90,6 +99,8 @@ def process_export(export_run_id: str) -> Dict[str, Any]:
                 all_files[source] = source_files
                 if geojson_file_path:
                     source_results[source]["geojson_path"] = geojson_file_path
+                elif tiles_enabled:
+                    tile_gdfs[source] = gdf
                 source_results[source]["has_data"] = True
 
             logger.info("Processed %s buildings from %s", building_count, source)
@@ -131,7 +142,7 @@ def process_export(export_run_id: str) -> Dict[str, Any]:
                 ),
             }
 
-        if is_tippecanoe_available() and total_building_count > 0:
+        if tiles_enabled and total_building_count > 0:
             try:
                 existing_geojson_paths = []
                 gdfs_for_merge = []
@@ -140,26 +151,15 @@ def process_export(export_run_id: str) -> Dict[str, Any]:
                     result = source_results.get(source, {})
                     if result.get("geojson_path"):
                         existing_geojson_paths.append(result["geojson_path"])
-                    elif result.get("has_data"):
-                        gdf_result = processor.extract_buildings(
-                            area_of_interest=export.area_of_interest,
-                            source=source,
-                            source_config=export.source_config,
-                        )
-                        if (
-                            not gdf_result.get("error")
-                            and gdf_result.get("gdf") is not None
-                        ):
-                            gdfs_for_merge.append(gdf_result["gdf"])
+                    elif source in tile_gdfs:
+                        gdfs_for_merge.append(tile_gdfs[source])
 
                 if existing_geojson_paths and len(existing_geojson_paths) == 1:
                     generate_pmtiles_from_geojson(existing_geojson_paths[0], export_run)
                 elif existing_geojson_paths and len(existing_geojson_paths) > 1:
                     generate_pmtiles_from_multiple_geojson(existing_geojson_paths, export_run)
                 elif gdfs_for_merge:
-                    combined_gdf = gdfs_for_merge[0]
-                    for gdf in gdfs_for_merge[1:]:
-                        combined_gdf = combined_gdf.append(gdf, ignore_index=True)
+                    combined_gdf = pd.concat(gdfs_for_merge, ignore_index=True)
                     generate_pmtiles_from_gdf(combined_gdf, export_run)
 
                 final_results["tiles_generated"] = True
@@ -261,7 +261,7 @@ def _package_files(
     return str(zip_path)
 
 
-@task()
+@task(priority=SHORT_TASK_PRIORITY)
 def send_export_completion_email(export_run_id: str) -> bool:
     try:
         export_run = ExportRun.objects.get(id=export_run_id)
@@ -2,7 +2,6 @@ from django.urls import path
 
 from ..views import api_views
 from ..views.api_root import APIRootView
-from ..views.api_views import rerun_export
 
 app_name = "api"
 
@@ -42,7 +41,7 @@ urlpatterns = [
     ),
     path(
         "exports/rerun/<uuid:export_id>/",
-        rerun_export,
+        api_views.rerun_export,
         name="rerun-export",
     ),
     # Public exports
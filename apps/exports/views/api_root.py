@@ -1,6 +1,4 @@
-import os
-
-import toml
+from django.conf import settings
 from drf_spectacular.utils import extend_schema
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -26,22 +24,9 @@ class APIRootView(APIView):
     permission_classes = []
 
     def get(self, request):
-        version = "unknown"
-        pyproject_path = os.path.join(
-            os.path.dirname(
-                os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            ),
-            "pyproject.toml",
-        )
-        try:
-            with open(pyproject_path, "r", encoding="utf-8") as f:
-                pyproject = toml.load(f)
-                version = pyproject.get("project", {}).get("version", "unknown")
-        except Exception:
-            pass
         return Response(
             {
-                "api_version": version,
+                "api_version": settings.VERSION,
                 "docs": request.build_absolute_uri("/api/docs/"),
                 "schema": request.build_absolute_uri("/api/schema/"),
                 "redoc": request.build_absolute_uri("/api/redoc/"),
@@ -1,17 +1,30 @@
+import hashlib
 import json
+import logging
 import re
-
-from django.contrib.gis.geos import GEOSGeometry
-from django.core.exceptions import ValidationError
-from django.db.models import Q
-from django.http import FileResponse, Http404, HttpResponse
+from urllib.parse import quote
+
+import orjson
+from django.conf import settings
+from django.contrib.gis.db.models.functions import AsGeoJSON
+from django.core.cache import cache
+from django.db import transaction
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.http import content_disposition_header
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from pyproj import Geod
+from redis.exceptions import RedisError
 from rest_framework import filters, generics, status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from shapely.errors import ShapelyError
+from shapely.geometry import Polygon, box
+from shapely.geometry.polygon import orient
 
 from ..filters import ExportFilter, ExportRunFilter
 from ..models import SOURCE_CONFIG_SCHEMA, Export, ExportRun
@@ -22,6 +35,140 @@ from ..serializers import (
 )
 from ..tasks import process_export
 
+logger = logging.getLogger(__name__)
+
+
+def _stored_file_size(name):
+    if not name:
+        return 0
+    try:
+        return ExportRun._meta.get_field("output_file").storage.size(name)
+    except (OSError, ValueError):
+        return 0
+
+
+def _queue_export_run(export_run, update_fields=None):
+    """Save the run as queued and enqueue processing once the save commits."""
+    task = process_export.s(str(export_run.id))
+    export_run.status = "queued"
+    export_run.task_id = task.id
+    with transaction.atomic():
+        export_run.save(update_fields=update_fields)
+        transaction.on_commit(lambda: process_export.huey.enqueue(task))
+
+
+DOWNLOAD_BLOCK_SIZE = 512 * 1024
+
+
+def _download_response(export_run):
+    prefix = settings.DOWNLOAD_ACCEL_REDIRECT_PREFIX
+    # runserver has no proxy in front of it, so stream directly in DEBUG.
+    if prefix and not settings.DEBUG:
+        response = HttpResponse(content_type="application/octet-stream")
+        response["Content-Disposition"] = content_disposition_header(
+            True, export_run.output_filename
+        )
+        response["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + quote(
+            export_run.output_file.name
+        )
+        return response
+
+    response = FileResponse(
+        export_run.output_file.open("rb"),
+        as_attachment=True,
+        filename=export_run.output_filename,
+    )
+    # Exports can be hundreds of MB; the default 4 KB chunks cost a read per chunk.
+    response.block_size = DOWNLOAD_BLOCK_SIZE
+    return response
+
+
+class _FileRange:
+    """Iterate ``length`` bytes from ``start`` of an already open file.
+
+    A class rather than a generator so StreamingHttpResponse registers
+    ``close()`` and releases the file even if the body is never iterated.
+    """
+
+    def __init__(self, file_obj, start, length):
+        self.file_obj = file_obj
+        self.start = start
+        self.length = length
+
+    def __iter__(self):
+        self.file_obj.seek(self.start)
+        remaining = self.length
+        while remaining > 0:
+            chunk = self.file_obj.read(min(DOWNLOAD_BLOCK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+    def close(self):
+        self.file_obj.close()
+
+
+def _schema_body(source, schema):
+    body = orjson.dumps({"source": source, "schema": schema})
+    return body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+# The schemas are static, so each response body is rendered once at import.
+_SOURCE_SCHEMA_BODIES = {
+    source: _schema_body(source, schema)
+    for source, schema in SOURCE_CONFIG_SCHEMA.items()
+}
+
+
+_WGS84 = Geod(ellps="WGS84")
+
+AOI_CACHE_TIMEOUT = 60 * 60
+# Part of the cache key; bump whenever validation results can change so a
+# deploy never serves answers computed by the previous logic.
+AOI_CACHE_VERSION = 3
+
+
+def _validate_aoi(rings, strict=False):
+    """Validate GeoJSON polygon rings; returns (error, area_km2, lat, lng)."""
+    for ring in rings:
+        if len(ring) < 4 or ring[0] != ring[-1]:
+            return "Invalid geometry", None, None, None
+
+    geometry = Polygon(rings[0], rings[1:])
+
+    # Geodesic area is a linear pass over the vertices; the validity check is
+    # the expensive step, so oversized AOIs are rejected before it runs.
+    # The geodesic area is signed by ring winding; orient the exterior CCW and
+    # holes CW so holes are always subtracted.
+    area_m2, _ = _WGS84.geometry_area_perimeter(orient(geometry, 1.0))
+    area_km2 = area_m2 / 1_000_000
+    if area_km2 > 10000:
+        return "Area too large (max 10,000 km²)", None, None, None
+
+    # Lobes of a self-intersecting ring cancel in the signed area, so the guard
+    # above only holds for valid rings. No lobe can be larger than the bounding
+    # box, so the expensive validity check is skipped only when the box itself
+    # is under the limit, unless ?strict=1 asks for it anyway.
+    if not strict:
+        box_m2, _ = _WGS84.geometry_area_perimeter(box(*geometry.bounds))
+        strict = box_m2 / 1_000_000 > 10000
+    if strict and not geometry.is_valid:
+        return "Invalid geometry", None, None, None
+
+    centroid = geometry.centroid
+    return None, area_km2, centroid.y, centroid.x
+
+
+class DefaultOrderingMixin:
+    """Skip the filter backends when the request carries no query parameters."""
+
+    def filter_queryset(self, queryset):
+        # With no parameters the backends are no-ops apart from default ordering.
+        if not self.request.query_params:
+            return queryset.order_by(*self.ordering)
+        return super().filter_queryset(queryset)
+
 
 @extend_schema(
     tags=["Exports"],
@@ -32,7 +179,7 @@ from ..tasks import process_export
         201: ExportSerializer,
     }
 )
-class ExportListCreateView(generics.ListCreateAPIView):
+class ExportListCreateView(DefaultOrderingMixin, generics.ListCreateAPIView):
     serializer_class = ExportSerializer
     permission_classes = []
     filter_backends = [
@@ -48,22 +195,17 @@ class ExportListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
             return Export.objects.none()
-        user = self.request.user
-        if user.is_authenticated:
-            return Export.objects.filter(Q(user=user) | Q(is_public=True))
-        return Export.objects.filter(is_public=True)
+        return Export.objects.visible_to(self.request.user).with_run_summary()
 
     def perform_create(self, serializer):
-        export = serializer.save(user=self.request.user)
-
-        export_run = ExportRun.objects.create(export=export)
-
-        export_run.status = "queued"
-        export_run.save()
-
-        task = process_export.schedule((str(export_run.id),), delay=1)
-        export_run.task_id = task.id
-        export_run.save()
+        # One transaction for the export, its first run and the processing flag,
+        # so the request commits once and never leaves an export without a run.
+        with transaction.atomic():
+            export = serializer.save(user=self.request.user)
+            _queue_export_run(ExportRun(export=export))
+        # The run set the flag with a queryset update; mirror it on the
+        # instance the response is rendered from.
+        export.is_processing_flag = True
 
 
 @extend_schema(
@@ -82,10 +224,7 @@ class ExportDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
             return Export.objects.none()
-        user = self.request.user
-        if user.is_authenticated:
-            return Export.objects.filter(Q(user=user) | Q(is_public=True))
-        return Export.objects.filter(is_public=True)
+        return Export.objects.visible_to(self.request.user).select_related("user")
 
 
 @extend_schema(
@@ -97,7 +236,7 @@ class ExportDetailView(generics.RetrieveUpdateDestroyAPIView):
         404: {"description": "Export not found"},
     }
 )
-class ExportRunListView(generics.ListAPIView):
+class ExportRunListView(DefaultOrderingMixin, generics.ListAPIView):
     serializer_class = ExportRunSerializer
     permission_classes = []
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
@@ -108,13 +247,13 @@ class ExportRunListView(generics.ListAPIView):
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
             return ExportRun.objects.none()
-        export_id = self.kwargs["export_id"]
-        user = self.request.user
-        if user.is_authenticated:
-            return ExportRun.objects.filter(export_id=export_id).filter(
-                Q(export__user=user) | Q(export__is_public=True)
-            )
-        return ExportRun.objects.filter(export_id=export_id, export__is_public=True)
+        export = get_object_or_404(
+            Export.objects.visible_to(self.request.user).only("id", "name", "source"),
+            pk=self.kwargs["export_id"],
+        )
+        # Runs fetched through the related manager get this export attached,
+        # so the query needs no join and str(run.export) costs nothing.
+        return export.runs.all()
 
 
 @extend_schema(
@@ -133,15 +272,22 @@ class ExportRunCreateView(generics.CreateAPIView):
 
     def perform_create(self, serializer):
         export_id = self.kwargs["export_id"]
-        try:
-            export = Export.objects.get(id=export_id, user=self.request.user)
-        except Export.DoesNotExist:
-            raise ValidationError("Export not found")
+        with transaction.atomic():
+            # Lock the export so concurrent requests cannot both pass the
+            # processing check and create two active runs.
+            export = (
+                Export.objects.select_for_update()
+                .only("id", "is_processing_flag")
+                .filter(id=export_id, user=self.request.user)
+                .first()
+            )
+            if export is None:
+                raise NotFound("Export not found")
 
-        if export.is_processing:
-            raise ValidationError("Export is already being processed")
+            if export.is_processing_flag:
+                raise ValidationError("Export is already being processed")
 
-        serializer.save(export=export)
+            serializer.save(export=export)
 
 
 @extend_schema(
@@ -160,12 +306,7 @@ class ExportRunDetailView(generics.RetrieveAPIView):
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
             return ExportRun.objects.none()
-        user = self.request.user
-        if user.is_authenticated:
-            return ExportRun.objects.filter(
-                Q(export__user=user) | Q(export__is_public=True)
-            )
-        return ExportRun.objects.filter(export__is_public=True)
+        return ExportRun.objects.visible_to(self.request.user).select_related("export")
 
 
 @extend_schema(
@@ -183,30 +324,18 @@ class StartExportRunView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, pk):
-        try:
-            export_run = ExportRun.objects.get(pk=pk, export__user=request.user)
-
-            if export_run.export.is_processing:
-                return Response(
-                    {"error": "Export is already being processed"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            export_run.status = "queued"
-            export_run.save()
-
-            task = process_export.schedule((str(export_run.id),), delay=1)
-            export_run.task_id = task.id
-            export_run.save()
-
-            serializer = ExportRunSerializer(export_run)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+        export_run = get_object_or_404(ExportRun.objects.owned_by(request.user), pk=pk)
 
-        except ExportRun.DoesNotExist:
+        if export_run.export.is_processing_flag:
             return Response(
-                {"error": "Export run not found"}, status=status.HTTP_404_NOT_FOUND
+                {"error": "Export is already being processed"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
+        _queue_export_run(export_run, update_fields=["status", "task_id", "updated_at"])
+
+        return Response(export_run.as_api_dict(), status=status.HTTP_200_OK)
+
 
 @extend_schema(
     tags=["Export Runs"],
@@ -229,24 +358,20 @@ class DownloadExportRunView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pk):
-        try:
-            export_run = ExportRun.objects.get(pk=pk, export__user=request.user)
-
-            if export_run.status != "completed" or not export_run.output_file:
-                return Response(
-                    {"error": "Export run is not completed or has no output file"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            response = FileResponse(
-                export_run.output_file.open("rb"),
-                as_attachment=True,
-                filename=export_run.output_file.name.split("/")[-1],
+        export_run = get_object_or_404(
+            ExportRun.objects.filter(export__user=request.user).only(
+                "id", "status", "output_file"
+            ),
+            pk=pk,
+        )
+
+        if export_run.status != "completed" or not export_run.output_file:
+            return Response(
+                {"error": "Export run is not completed or has no output file"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-            return response
 
-        except ExportRun.DoesNotExist:
-            raise Http404("Export run not found")
+        return _download_response(export_run)
 
 
 @extend_schema(
@@ -270,24 +395,21 @@ class PublicDownloadExportRunView(APIView):
     permission_classes = []
 
     def get(self, request, pk):
-        try:
-            export_run = ExportRun.objects.get(pk=pk, export__is_public=True)
-
-            if export_run.status != "completed" or not export_run.output_file:
-                return Response(
-                    {"error": "Export run is not completed or has no output file"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+        export_run = (
+            ExportRun.objects.filter(pk=pk, export__is_public=True)
+            .only("id", "status", "output_file")
+            .first()
+        )
+        if export_run is None:
+            raise Http404("Export run not found")
 
-            response = FileResponse(
-                export_run.output_file.open("rb"),
-                as_attachment=True,
-                filename=export_run.output_file.name.split("/")[-1],
+        if export_run.status != "completed" or not export_run.output_file:
+            return Response(
+                {"error": "Export run is not completed or has no output file"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-            return response
 
-        except ExportRun.DoesNotExist:
-            raise Http404("Export run not found")
+        return _download_response(export_run)
 
 
 @extend_schema(
@@ -305,7 +427,7 @@ class PublicExportDetailView(generics.RetrieveAPIView):
     lookup_field = "pk"
 
     def get_queryset(self):
-        return Export.objects.filter(is_public=True)
+        return Export.objects.filter(is_public=True).select_related("user")
 
 
 @extend_schema(
@@ -317,7 +439,7 @@ class PublicExportDetailView(generics.RetrieveAPIView):
         404: {"description": "Export not found or not public"},
     }
 )
-class PublicExportRunListView(generics.ListAPIView):
+class PublicExportRunListView(DefaultOrderingMixin, generics.ListAPIView):
     serializer_class = ExportRunSerializer
     permission_classes = []
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
@@ -327,7 +449,9 @@ class PublicExportRunListView(generics.ListAPIView):
 
     def get_queryset(self):
         export_id = self.kwargs.get("export_id")
-        return ExportRun.objects.filter(export_id=export_id, export__is_public=True)
+        return ExportRun.objects.select_related("export").filter(
+            export_id=export_id, export__is_public=True
+        )
 
 
 @extend_schema(
@@ -361,42 +485,58 @@ class ExportRunStatsView(APIView):
     permission_classes = []
 
     def get(self, request, pk):
-        try:
-            export_run = ExportRun.objects.get(pk=pk)
-
-            if (
-                not export_run.export.is_public
-                and export_run.export.user != request.user
-            ):
-                if not request.user.is_authenticated:
-                    return Response({"error": "Authentication required"}, status=401)
-                return Response({"error": "Access denied"}, status=403)
-
-            stats = {
-                "run_id": str(export_run.id),
-                "export_name": export_run.export.name,
-                "status": export_run.status,
-                "building_count": export_run.building_count,
-                "file_size": export_run.file_size,
-                "duration": str(export_run.duration) if export_run.duration else None,
-                "sources": export_run.results.get("sources", {}),
-                "files": export_run.results.get("files", {}),
-                "population": export_run.results.get("population", {}),
-                "created_at": export_run.created_at.isoformat(),
-                "completed_at": export_run.completed_at.isoformat()
-                if export_run.completed_at
-                else None,
-                "area_of_interest": json.loads(
-                    export_run.export.area_of_interest.geojson
-                ),
-                "output_formats": export_run.export.output_format,
-            }
-
-            return Response(stats)
-
-        except ExportRun.DoesNotExist:
+        run = (
+            ExportRun.objects.filter(pk=pk)
+            .with_can_view(request.user)
+            .annotate(aoi_geojson=AsGeoJSON("export__area_of_interest"))
+            .values(
+                "id",
+                "status",
+                "results",
+                "output_file",
+                "started_at",
+                "completed_at",
+                "created_at",
+                "export__name",
+                "export__output_format",
+                "aoi_geojson",
+                "can_view",
+            )
+            .first()
+        )
+        if run is None:
             raise Http404("Export run not found")
 
+        if not run["can_view"]:
+            if not request.user.is_authenticated:
+                return Response({"error": "Authentication required"}, status=401)
+            return Response({"error": "Access denied"}, status=403)
+
+        results = run["results"]
+        duration = None
+        if run["started_at"] and run["completed_at"]:
+            duration = run["completed_at"] - run["started_at"]
+
+        stats = {
+            "run_id": str(run["id"]),
+            "export_name": run["export__name"],
+            "status": run["status"],
+            "building_count": results.get("building_count", 0),
+            "file_size": _stored_file_size(run["output_file"]),
+            "duration": str(duration) if duration else None,
+            "sources": results.get("sources", {}),
+            "files": results.get("files", {}),
+            "population": results.get("population", {}),
+            "created_at": run["created_at"].isoformat(),
+            "completed_at": run["completed_at"].isoformat()
+            if run["completed_at"]
+            else None,
+            "area_of_interest": orjson.loads(run["aoi_geojson"]),
+            "output_formats": run["export__output_format"],
+        }
+
+        return Response(stats)
+
 
 @extend_schema(
     tags=["Tiles"],
@@ -419,69 +559,70 @@ class ExportRunTilesView(APIView):
     permission_classes = []
 
     def get(self, request, pk):
-        try:
-            export_run = ExportRun.objects.get(pk=pk)
-
-            if (
-                not export_run.export.is_public
-                and export_run.export.user != request.user
-            ):
-                if not request.user.is_authenticated:
-                    return Response({"error": "Authentication required"}, status=401)
-                return Response({"error": "Access denied"}, status=403)
-
-            if not export_run.tiles_file:
-                return Response({"error": "No tiles available"}, status=404)
-
-            file_obj = export_run.tiles_file.open('rb')
-            file_size = export_run.tiles_file.size
-            range_header = request.META.get('HTTP_RANGE')
-            
-            if range_header:
-                range_match = re.match(r'bytes=(\d+)-(\d*)', range_header)
-                if range_match:
-                    start = int(range_match.group(1))
-                    end = int(range_match.group(2)) if range_match.group(2) else file_size - 1
-                    
-                    if start >= file_size or end >= file_size or start > end:
-                        file_obj.close()
-                        response = HttpResponse(status=416)
-                        response['Content-Range'] = f'bytes */{file_size}'
-                        response['Accept-Ranges'] = 'bytes'
-                        response['Access-Control-Allow-Origin'] = '*'
-                        return response
-                    
-                    file_obj.seek(start)
-                    content = file_obj.read(end - start + 1)
-                    file_obj.close()
-                    
-                    response = HttpResponse(content, status=206, content_type="application/octet-stream")
-                    response['Accept-Ranges'] = 'bytes'
-                    response['Content-Range'] = f'bytes {start}-{end}/{file_size}'
-                    response['Content-Length'] = str(len(content))
-                    response['Access-Control-Allow-Origin'] = '*'
-                    response['Access-Control-Allow-Headers'] = 'Range'
-                    response['Access-Control-Expose-Headers'] = 'Content-Range, Content-Length, Accept-Ranges'
-                    return response
-
-            content = file_obj.read()
-            file_obj.close()
-            response = HttpResponse(content, content_type="application/octet-stream")
-            response['Accept-Ranges'] = 'bytes'
+        export_run = (
+            ExportRun.objects.filter(pk=pk)
+            .with_can_view(request.user)
+            .only("id", "tiles_file")
+            .first()
+        )
+        if export_run is None:
+            raise Http404("Export run not found")
+
+        if not export_run.can_view:
+            if not request.user.is_authenticated:
+                return Response({"error": "Authentication required"}, status=401)
+            return Response({"error": "Access denied"}, status=403)
+
+        if not export_run.tiles_file:
+            return Response({"error": "No tiles available"}, status=404)
+
+        file_size = export_run.tiles_file.size
+        range_header = request.META.get('HTTP_RANGE')
+        range_match = re.match(r'bytes=(\d+)-(\d*)', range_header) if range_header else None
+
+        if range_match:
+            start = int(range_match.group(1))
+            end = int(range_match.group(2)) if range_match.group(2) else file_size - 1
+
+            if start >= file_size or end >= file_size or start > end:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{file_size}'
+                response['Accept-Ranges'] = 'bytes'
+                response['Access-Control-Allow-Origin'] = '*'
+                return response
+
+            length = end - start + 1
+            tiles = export_run.tiles_file.open('rb')
+            response = StreamingHttpResponse(
+                _FileRange(tiles, start, length),
+                status=206,
+                content_type="application/octet-stream",
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{file_size}'
+            response['Content-Length'] = str(length)
+        else:
+            response = FileResponse(
+                export_run.tiles_file.open('rb'), content_type="application/octet-stream"
+            )
+            response.block_size = DOWNLOAD_BLOCK_SIZE
             response['Content-Length'] = str(file_size)
-            response['Access-Control-Allow-Origin'] = '*'
-            response['Access-Control-Allow-Headers'] = 'Range'
-            response['Access-Control-Expose-Headers'] = 'Content-Range, Content-Length, Accept-Ranges'
-            return response
 
-        except ExportRun.DoesNotExist:
-            raise Http404("Export run not found")
+        response['Accept-Ranges'] = 'bytes'
+        response['Access-Control-Allow-Origin'] = '*'
+        response['Access-Control-Allow-Headers'] = 'Range'
+        response['Access-Control-Expose-Headers'] = 'Content-Range, Content-Length, Accept-Ranges'
+        return response
 
 
 @extend_schema(
     tags=["Utilities"],
     summary="Validate area of interest geometry",
-    description="Validate a GeoJSON geometry for use as area of interest. Returns validation status, area in km², and centroid.",
+    description="Validate a GeoJSON geometry for use as area of interest. Returns validation status, area in km², and centroid. Rings are checked for closure and point count; pass ?strict=1 for a full topological validity check.",
+    parameters=[
+        OpenApiParameter(
+            "strict", bool, description="Also run a full OGC validity check"
+        ),
+    ],
     request={
         "type": "object",
         "properties": {
@@ -514,6 +655,31 @@ class ValidateAOIView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
+        # Clients resubmit the same AOI while editing other export fields, so
+        # results are cached by a hash of the raw body before any parsing.
+        body_hash = hashlib.blake2b(request.body, digest_size=16).hexdigest()
+        strict = request.query_params.get("strict") in ("1", "true")
+        cache_key = f"validate-aoi:v{AOI_CACHE_VERSION}:{strict}:{body_hash}"
+        # The cache is only an accelerator; a Redis outage must not fail validation.
+        try:
+            cached = cache.get(cache_key)
+        except RedisError:
+            logger.warning("AOI validation cache read failed", exc_info=True)
+            cached = None
+        if cached is not None:
+            data, status_code = cached
+            return Response(data, status=status_code)
+
+        response = self._validate(request, strict)
+        try:
+            cache.set(
+                cache_key, (response.data, response.status_code), AOI_CACHE_TIMEOUT
+            )
+        except RedisError:
+            logger.warning("AOI validation cache write failed", exc_info=True)
+        return response
+
+    def _validate(self, request, strict):
         try:
             geojson_data = request.data.get("geometry")
             if not geojson_data:
@@ -522,40 +688,40 @@ class ValidateAOIView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            geometry = GEOSGeometry(json.dumps(geojson_data))
-
-            if not geometry.valid:
-                return Response(
-                    {"error": "Invalid geometry"}, status=status.HTTP_400_BAD_REQUEST
-                )
-
-            if geometry.geom_type != "Polygon":
+            if isinstance(geojson_data, str):
+                geojson_data = json.loads(geojson_data)
+            # The type is a plain key lookup, so reject non-polygons before
+            # building any geometry.
+            if geojson_data.get("type") != "Polygon":
                 return Response(
                     {"error": "Geometry must be a Polygon"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            area_deg2 = geometry.area
-            area_km2 = area_deg2 * 111.32 * 111.32
-
-            if area_km2 > 10000:
-                return Response(
-                    {"error": "Area too large (max 10,000 km²)"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+            rings = geojson_data["coordinates"]
+            error, area_km2, lat, lng = _validate_aoi(rings, strict)
+            if error:
+                return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
 
             return Response(
                 {
                     "valid": True,
                     "area_km2": round(area_km2, 2),
                     "centroid": {
-                        "lat": geometry.centroid.y,
-                        "lng": geometry.centroid.x,
+                        "lat": lat,
+                        "lng": lng,
                     },
                 }
             )
 
-        except (ValueError, TypeError, ValidationError) as e:
+        except (
+            ValueError,
+            TypeError,
+            KeyError,
+            IndexError,
+            AttributeError,
+            ShapelyError,
+        ) as e:
             return Response(
                 {"error": f"Invalid geometry: {str(e)}"},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -581,12 +747,20 @@ class SourceConfigSchemaView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, source):
-        if source not in SOURCE_CONFIG_SCHEMA:
+        cached = _SOURCE_SCHEMA_BODIES.get(source)
+        if cached is None:
             return Response(
                 {"error": f"Unknown source: {source}"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        return Response({"source": source, "schema": SOURCE_CONFIG_SCHEMA[source]})
+        body, etag = cached
+        if request.headers.get("If-None-Match") == etag:
+            response = HttpResponse(status=304)
+        else:
+            response = HttpResponse(body, content_type="application/json")
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, max-age=3600"
+        return response
 
 
 @extend_schema(
@@ -603,13 +777,14 @@ class SourceConfigSchemaView(APIView):
 @permission_classes([IsAuthenticated])
 def rerun_export(request, export_id):
     try:
-        export = Export.objects.get(id=export_id)
+        # Only the fields behind str(export) are needed for the response; skip
+        # loading the AOI polygon.
+        export = Export.objects.only("id", "name", "source").get(id=export_id)
     except Export.DoesNotExist:
         return Response({"error": "Export not found"}, status=status.HTTP_404_NOT_FOUND)
-    run = ExportRun.objects.create(export=export, status="queued")
-    process_export.schedule((str(run.id),), delay=1)
-    serializer = ExportRunSerializer(run)
-    return Response(serializer.data, status=status.HTTP_201_CREATED)
+    run = ExportRun(export=export)
+    _queue_export_run(run)
+    return Response(run.as_api_dict(), status=status.HTTP_201_CREATED)
 
 
 @extend_schema(
@@ -620,7 +795,7 @@ def rerun_export(request, export_id):
         200: ExportSerializer(many=True),
     }
 )
-class PublicExportListView(generics.ListAPIView):
+class PublicExportListView(DefaultOrderingMixin, generics.ListAPIView):
     serializer_class = ExportSerializer
     permission_classes = []
     filter_backends = [
@@ -636,4 +811,4 @@ class PublicExportListView(generics.ListAPIView):
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
             return Export.objects.none()
-        return Export.objects.filter(is_public=True)
+        return Export.objects.filter(is_public=True).with_run_summary()
@@ -1,22 +1,28 @@
 from django.http import JsonResponse
 from django.db import connection, DatabaseError
 from django.core.cache import cache, CacheKeyWarning
+from redis.exceptions import RedisError
+
+
+def liveness_check(_request):
+    # Process-only: restarting the pod will not fix a database or Redis outage.
+    return JsonResponse({"status": "alive"})
 
 
 def health_check(_request):
     try:
         with connection.cursor() as cursor:
             cursor.execute("SELECT 1")
-        
-        cache.set("health_check", "ok", 1)
-        cache_status = cache.get("health_check")
-        
+
+        # One round trip while the key is fresh instead of a set followed by a get.
+        cache_status = cache.get_or_set("health_check", "ok", 1)
+
         return JsonResponse({
             "status": "healthy",
             "database": "ok",
             "cache": "ok" if cache_status == "ok" else "error"
         })
-    except (DatabaseError, CacheKeyWarning):
+    except (DatabaseError, RedisError, CacheKeyWarning):
         return JsonResponse({
             "status": "unhealthy"
         }, status=503)
@@ -0,0 +1,54 @@
+import copy
+import logging
+import os
+import queue
+from logging.handlers import QueueListener, WatchedFileHandler
+
+
+class QueuedFileHandler(logging.Handler):
+    """File log written from a background thread instead of the caller's.
+
+    A plain Handler rather than a QueueHandler subclass: from Python 3.12
+    dictConfig insists every QueueHandler is wired to named target handlers.
+    The sink is a WatchedFileHandler because web and huey processes share the
+    file; rotate it externally (logrotate) rather than from inside Python.
+    """
+
+    def __init__(self, filename, encoding=None):
+        super().__init__()
+        self.sink = WatchedFileHandler(filename, encoding=encoding)
+        self._start_listener()
+        # Forked workers (huey process workers) don't inherit the listener thread.
+        os.register_at_fork(after_in_child=self._start_listener)
+
+    def _start_listener(self):
+        self.queue = queue.SimpleQueue()
+        self.listener = QueueListener(self.queue, self.sink)
+        self.listener.start()
+
+    def setFormatter(self, fmt):
+        # Records are formatted by the sink on the listener thread.
+        self.sink.setFormatter(fmt)
+
+    def emit(self, record):
+        try:
+            # Same preparation as QueueHandler: render the message and traceback
+            # here so nothing mutable crosses the thread boundary.
+            msg = self.format(record)
+            record = copy.copy(record)
+            record.message = msg
+            record.msg = msg
+            record.args = None
+            record.exc_info = None
+            record.exc_text = None
+            record.stack_info = None
+            self.queue.put_nowait(record)
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        self.sink.close()
+        super().close()
@@ -0,0 +1,36 @@
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# orjson handles the native types itself; anything else goes through DRF's
+# encoder so Decimal, timedelta, sets and friends serialise as they always did.
+_drf_default = JSONEncoder().default
+
+
+class ORJSONRenderer(BaseRenderer):
+    """JSON renderer backed by orjson; output matches DRF's compact JSONRenderer.
+
+    Payloads orjson refuses, such as ints beyond 64 bits, are re-rendered by
+    JSONRenderer. One known difference remains: NaN and infinity become
+    ``null`` here, where JSONRenderer raises ``ValueError``.
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        try:
+            ret = orjson.dumps(
+                data,
+                default=_drf_default,
+                option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            return JSONRenderer().render(data, accepted_media_type, renderer_context)
+        # Like JSONRenderer, escape the separators that are invalid in JavaScript.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
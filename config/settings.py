@@ -1,21 +1,10 @@
 import os
-import tomllib
 from datetime import timedelta
 from pathlib import Path
 
-BASE_DIR = Path(__file__).resolve().parent.parent
-
-
-def get_version():
-    try:
-        with open(BASE_DIR / "pyproject.toml", "rb") as f:
-            data = tomllib.load(f)
-            return data["project"]["version"]
-    except (FileNotFoundError, KeyError, tomllib.TOMLDecodeError):
-        return "0.1.0"
-
+from ._version import VERSION
 
-VERSION = get_version()
+BASE_DIR = Path(__file__).resolve().parent.parent
 
 try:
     import environ
@@ -55,6 +44,15 @@ except ImportError:
         }
     }
 
+# Reuse connections across requests; health checks drop ones the server closed.
+DATABASES["default"].setdefault("CONN_MAX_AGE", int(env("CONN_MAX_AGE", default=60)))
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+DATABASES["default"].setdefault("OPTIONS", {}).setdefault("connect_timeout", 5)
+# Required behind pgbouncer in transaction pooling mode.
+DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = env(
+    "DISABLE_SERVER_SIDE_CURSORS", default="false"
+).lower() in ("true", "1", "yes", "on")
+
 AUTH_USER_MODEL = "accounts.User"
 DJANGO_APPS = [
     "django.contrib.admin",
@@ -145,8 +143,21 @@ STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
 
+if not DEBUG:
+    # Hashed, pre-compressed files let WhiteNoise serve them with far-future
+    # cache headers and without compressing per request.
+    STORAGES = {
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {
+            "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"
+        },
+    }
+
 MEDIA_URL = env("MEDIA_URL", default="/media/")
 MEDIA_ROOT = BASE_DIR / "media"
+# When set (e.g. "/protected-media/"), downloads are handed to the front proxy
+# via X-Accel-Redirect instead of being streamed by the Django worker.
+DOWNLOAD_ACCEL_REDIRECT_PREFIX = env("DOWNLOAD_ACCEL_REDIRECT_PREFIX", default="")
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -159,6 +170,7 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_RENDERER_CLASSES": [
+        "config.renderers.ORJSONRenderer",
         "rest_framework.renderers.JSONRenderer",
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
@@ -245,16 +257,28 @@ DEFAULT_FROM_EMAIL = env("DEFAULT_FROM_EMAIL", default="noreply@localhost")
 
 WORLDPOP_API_KEY = env("WORLDPOP_API_KEY", default=None)
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": env("REDIS_URL", default="redis://localhost:6379/0"),
+        "KEY_PREFIX": "obe_app",
+    }
+}
+
 HUEY = {
-    "huey_class": "huey.RedisHuey",
+    "huey_class": "huey.PriorityRedisHuey",
     "immediate": False,
     "name": "obe_app",
     "connection": {
         "url": env("REDIS_URL", default="redis://localhost:6379/0"),
     },
     "consumer": {
-        "workers": 4,
-        "worker_type": "process",
+        "workers": int(env("HUEY_WORKERS", default=4)),
+        # Exports mix network downloads with GeoPandas/tippecanoe CPU work, so
+        # process workers remain the default; threads suit I/O-heavy hosts.
+        "worker_type": env("HUEY_WORKER_TYPE", default="process"),
+        "check_worker_health": True,
+        "health_check_interval": 10,
     },
 }
 
@@ -290,7 +314,7 @@ LOGGING = {
             "formatter": "simple",
         },
         "file": {
-            "class": "logging.FileHandler",
+            "class": "config.log_handlers.QueuedFileHandler",
             "filename": LOGS_DIR / "django.log",
             "formatter": "verbose",
         },
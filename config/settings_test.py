@@ -0,0 +1,25 @@
+from .settings import *  # noqa: F401,F403
+
+# Hash strength is irrelevant in tests and PBKDF2 dominates user creation.
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+class DisableMigrations:
+    """Build the test schema straight from the models instead of migrating."""
+
+    def __contains__(self, item):
+        return True
+
+    def __getitem__(self, item):
+        return None
+
+
+MIGRATION_MODULES = DisableMigrations()
+
+# The test runner already forces DEBUG off at runtime, but the apps logger
+# level and log file are picked from the env at import. Leave logging
+# unconfigured so only warnings and errors reach stderr.
+LOGGING_CONFIG = None
+
+# Per-process cache: no Redis needed, and nothing survives between runs.
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
@@ -7,11 +7,13 @@ from drf_spectacular.views import (
     SpectacularRedocView,
     SpectacularSwaggerView,
 )
-from .health import health_check
+from .health import health_check, liveness_check
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("health/", health_check, name="health_check"),
+    path("health/live/", liveness_check, name="liveness_check"),
+    path("health/ready/", health_check, name="readiness_check"),
     # Frontend views
     path("", include("apps.frontend.urls")),
     # API Documentation
@@ -3,7 +3,8 @@ import os
 import sys
 
 if __name__ == '__main__':
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    settings_module = 'config.settings_test' if sys.argv[1:2] == ['test'] else 'config.settings'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
     
     try:
         from django.core.management import execute_from_command_line
@@ -1,17 +1,97 @@
+import json
+import logging
+import logging.config
+import tempfile
+import uuid
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from functools import lru_cache
+from importlib import import_module
+from pathlib import Path
+from unittest.mock import patch
+
+from django.apps import apps as django_apps
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Polygon
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from redis.exceptions import RedisError
 from rest_framework import status
-from rest_framework.test import APITestCase
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APISimpleTestCase, APITestCase
+
+from apps.exports.models import Export, ExportRun
+from config.renderers import ORJSONRenderer
 
 User = get_user_model()
 
+# Tuples so the shared constant can't be mutated by a test; JSON encodes them
+# as arrays.
+NEPAL_POLYGON = {
+    "type": "Polygon",
+    "coordinates": (
+        (
+            (83.962, 28.213),
+            (83.962, 28.202),
+            (83.976, 28.202),
+            (83.976, 28.213),
+            (83.962, 28.213),
+        ),
+    ),
+}
+NEPAL_GEOM = Polygon(NEPAL_POLYGON["coordinates"][0], srid=4326)
+# Request bodies serialised once at import and posted as raw JSON.
+CREATE_EXPORT_BODY = json.dumps(
+    {
+        "name": "Test Export",
+        "description": "Test description",
+        "area_of_interest": NEPAL_POLYGON,
+        "source": "osm",
+        "output_format": "geojson",
+    }
+)
+VALIDATE_AOI_BODY = json.dumps({"geometry": NEPAL_POLYGON})
+
+
+@lru_cache(maxsize=256)
+def _rev(name, **kwargs):
+    """``reverse()`` memoised per name and kwargs; test URLs never change."""
+    return reverse(name, kwargs=kwargs or None)
+
+
+def _make_user(username, email, **flags):
+    """Create a user without hashing a password, for tests that never log in."""
+    user = User(username=username, email=email, **flags)
+    user.set_unusable_password()
+    user.save()
+    return user
+
 
 class AuthAPITest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.register_url = _rev("auth:register")
+        cls.login_url = _rev("auth:token_obtain_pair")
+        cls.refresh_url = _rev("auth:token_refresh")
+        cls.verify_url = _rev("auth:token_verify")
+        cls.profile_url = _rev("auth:profile")
+        cls.change_password_url = _rev("auth:change_password")
+        cls.user_list_url = _rev("auth:user_list")
+        cls.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="TestPass123!"
+        )
+        cls.staff_user = _make_user("staffuser", "staff@example.com", is_staff=True)
+
     def setUp(self):
         self.user_data = {
-            "username": "testuser",
-            "email": "test@example.com",
+            "username": "newuser",
+            "email": "new@example.com",
             "password": "TestPass123!",
             "password_confirm": "TestPass123!",
             "first_name": "Test",
@@ -19,61 +99,36 @@ class AuthAPITest(APITestCase):
         }
 
     def test_register(self):
-        url = reverse("auth:register")
+        url = self.register_url
         response = self.client.post(url, self.user_data, format="json")
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertIn("id", response.data["user"])
 
-    def test_login(self):
-        User.objects.create_user(
-            username="testuser", email="test@example.com", password="TestPass123!"
-        )
-        url = reverse("auth:token_obtain_pair")
-        data = {"username": "testuser", "password": "TestPass123!"}
-        response = self.client.post(url, data, format="json")
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIn("access", response.data)
-        self.assertIn("refresh", response.data)
-
-    def test_token_refresh(self):
-        user = User.objects.create_user(
-            username="testuser", email="test@example.com", password="TestPass123!"
-        )
-        refresh = RefreshToken.for_user(user)
-        url = reverse("auth:token_refresh")
-        data = {"refresh": str(refresh)}
-        response = self.client.post(url, data, format="json")
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIn("access", response.data)
-
-    def test_token_verify(self):
-        user = User.objects.create_user(
-            username="testuser", email="test@example.com", password="TestPass123!"
-        )
-        refresh = RefreshToken.for_user(user)
-        url = reverse("auth:token_verify")
-        data = {"token": str(refresh.access_token)}
-        response = self.client.post(url, data, format="json")
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-
-    def test_profile(self):
-        user = User.objects.create_user(
-            username="testuser", email="test@example.com", password="TestPass123!"
-        )
-        refresh = RefreshToken.for_user(user)
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
-        url = reverse("auth:profile")
-        response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data["username"], "testuser")
+    def test_password_jwt_lifecycle(self):
+        tokens = {}
+        with self.subTest(step="login"):
+            data = {"username": "testuser", "password": "TestPass123!"}
+            response = self.client.post(self.login_url, data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn("access", response.data)
+            self.assertIn("refresh", response.data)
+            tokens = response.data
+
+        with self.subTest(step="refresh"):
+            data = {"refresh": tokens["refresh"]}
+            response = self.client.post(self.refresh_url, data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn("access", response.data)
+            tokens = response.data
+
+        with self.subTest(step="verify"):
+            data = {"token": tokens["access"]}
+            response = self.client.post(self.verify_url, data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
 
     def test_change_password(self):
-        user = User.objects.create_user(
-            username="testuser", email="test@example.com", password="TestPass123!"
-        )
-        refresh = RefreshToken.for_user(user)
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
-        url = reverse("auth:change_password")
+        self.client.force_authenticate(user=self.user)
+        url = self.change_password_url
         data = {
             "old_password": "TestPass123!",
             "new_password": "NewPass123!",
@@ -82,288 +137,558 @@ class AuthAPITest(APITestCase):
         response = self.client.put(url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-    def test_user_list(self):
-        user = User.objects.create_user(
-            username="testuser",
-            email="test@example.com",
-            password="TestPass123!",
-            is_staff=True,
-        )
-        refresh = RefreshToken.for_user(user)
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
-        url = reverse("auth:user_list")
-        response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-
-    def test_user_detail(self):
-        user = User.objects.create_user(
-            username="testuser",
-            email="test@example.com",
-            password="TestPass123!",
-            is_staff=True,
-        )
-        refresh = RefreshToken.for_user(user)
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
-        url = reverse("auth:user_detail", kwargs={"pk": user.pk})
-        response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    def test_authenticated_reads(self):
+        self.client.force_authenticate(user=self.staff_user)
+        detail_url = _rev("auth:user_detail", pk=self.staff_user.pk)
+        urls = {
+            "profile": self.profile_url,
+            "user_list": self.user_list_url,
+            "user_detail": detail_url,
+        }
+        for name, url in urls.items():
+            with self.subTest(view=name):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                if name == "profile":
+                    self.assertEqual(response.data["username"], "staffuser")
 
 
 class ExportAPITest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = _make_user("testuser", "test@example.com")
+        cls.export_list_url = _rev("api:export_list")
+        # Each test runs in its own transaction, so update/delete can't leak.
+        export = Export.objects.create(
+            user=cls.user,
+            name="Test Export",
+            description="Test description",
+            area_of_interest=NEPAL_GEOM,
+            source=["osm"],
+            output_format=["geojson"],
+        )
+        cls.export_detail_url = _rev("api:export_detail", pk=export.pk)
+
     def setUp(self):
-        self.user = User.objects.create_user(
-            username="testuser", email="test@example.com", password="TestPass123!"
+        self.client.force_authenticate(user=self.user)
+
+    def test_create_export(self):
+        url = self.export_list_url
+        response = self.client.post(
+            url, CREATE_EXPORT_BODY, content_type="application/json"
         )
-        refresh = RefreshToken.for_user(self.user)
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["properties"]["name"], "Test Export")
+        self.assertIs(response.data["properties"]["is_processing"], True)
+        self.assertEqual(response.data["properties"]["latest_run"]["status"], "queued")
 
-        self.nepal_polygon = {
+    def test_create_export_rejects_self_intersecting_aoi(self):
+        body = json.loads(CREATE_EXPORT_BODY)
+        body["area_of_interest"] = {
             "type": "Polygon",
             "coordinates": [
                 [
-                    [83.962, 28.213],
-                    [83.962, 28.202],
-                    [83.976, 28.202],
-                    [83.976, 28.213],
-                    [83.962, 28.213],
+                    [83.96, 28.20],
+                    [83.98, 28.21],
+                    [83.98, 28.20],
+                    [83.96, 28.21],
+                    [83.96, 28.20],
                 ]
             ],
         }
-
-    def test_create_export(self):
-        url = reverse("api:export_list")
-        data = {
-            "name": "Test Export",
-            "description": "Test description",
-            "area_of_interest": self.nepal_polygon,
-            "source": "osm",
-            "output_format": "geojson",
-        }
-        response = self.client.post(url, data, format="json")
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(response.data["properties"]["name"], "Test Export")
+        response = self.client.post(self.export_list_url, body, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Export.objects.count(), 1)
 
     def test_list_exports(self):
-        url = reverse("api:export_list")
-        data = {
-            "name": "Test Export for List",
-            "description": "Test description",
-            "area_of_interest": self.nepal_polygon,
-            "source": "osm",
-            "output_format": "geojson",
-        }
-        self.client.post(url, data, format="json")
-        
-        response = self.client.get(url)
+        Export.objects.bulk_create(
+            [
+                Export(
+                    user=self.user,
+                    name=f"Test Export for List {i}",
+                    area_of_interest=NEPAL_GEOM,
+                    source=["osm"],
+                    output_format=["geojson"],
+                )
+                for i in range(2)
+            ]
+        )
+
+        response = self.client.get(self.export_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("results", response.data)
-        self.assertEqual(response.data["results"]["type"], "FeatureCollection")    def test_get_export(self):
-        url = reverse("api:export_list")
-        data = {
-            "name": "Test Export for Get",
-            "description": "Test description",
-            "area_of_interest": self.nepal_polygon,
-            "source": "osm",
-            "output_format": "geojson",
-        }
-        create_response = self.client.post(url, data, format="json")
-        export_id = create_response.data["properties"]["id"]
+        self.assertEqual(response.data["results"]["type"], "FeatureCollection")
+        self.assertEqual(len(response.data["results"]["features"]), 3)
 
-        url = reverse("api:export_detail", kwargs={"pk": export_id})
+    def test_get_export(self):
+        url = self.export_detail_url
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data["properties"]["name"], "Test Export for Get")
+        self.assertEqual(response.data["properties"]["name"], "Test Export")
 
     def test_update_export(self):
-        url = reverse("api:export_list")
-        data = {
-            "name": "Test Export for Update",
-            "description": "Test description",
-            "area_of_interest": self.nepal_polygon,
-            "source": "osm",
-            "output_format": "geojson",
-        }
-        create_response = self.client.post(url, data, format="json")
-        export_id = create_response.data["properties"]["id"]
-
-        url = reverse("api:export_detail", kwargs={"pk": export_id})
+        url = self.export_detail_url
         update_data = {"name": "Updated Export", "description": "Updated description"}
         response = self.client.patch(url, update_data, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["properties"]["name"], "Updated Export")
 
     def test_delete_export(self):
-        url = reverse("api:export_list")
-        data = {
-            "name": "Test Export for Delete",
-            "description": "Test description",
-            "area_of_interest": self.nepal_polygon,
-            "source": "osm",
-            "output_format": "geojson",
-        }
-        create_response = self.client.post(url, data, format="json")
-        export_id = create_response.data["properties"]["id"]
-
-        url = reverse("api:export_detail", kwargs={"pk": export_id})
+        url = self.export_detail_url
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
-    def test_unauthorized_access(self):
-        self.client.credentials()
-        url = reverse("api:export_list")
-        response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-
 
 class ExportRunAPITest(APITestCase):
-    def setUp(self):
-        self.user = User.objects.create_user(
-            username="testuser", email="test@example.com", password="TestPass123!"
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = _make_user("testuser", "test@example.com")
+        export = Export.objects.create(
+            user=cls.user,
+            name="Test Export for Runs",
+            description="Test export for run testing",
+            area_of_interest=NEPAL_GEOM,
+            source=["osm"],
+            output_format=["geojson"],
         )
-        refresh = RefreshToken.for_user(self.user)
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        cls.export_id = str(export.pk)
 
-        self.nepal_polygon = {
-            "type": "Polygon",
-            "coordinates": [
-                [
-                    [83.962, 28.213],
-                    [83.962, 28.202],
-                    [83.976, 28.202],
-                    [83.976, 28.213],
-                    [83.962, 28.213],
-                ]
-            ],
-        }
-
-        url = reverse("api:export_list")
-        data = {
-            "name": "Test Export for Runs",
-            "description": "Test export for run testing",
-            "area_of_interest": self.nepal_polygon,
-            "source": "osm",
-            "output_format": "geojson",
-        }
-        create_response = self.client.post(url, data, format="json")
-        self.export_id = create_response.data["properties"]["id"]
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
 
     def test_list_runs(self):
-        url = reverse("api:run_list", kwargs={"export_id": self.export_id})
+        url = _rev("api:run_list", export_id=self.export_id)
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_list_runs_query_count(self):
+        url = _rev("api:run_list", export_id=self.export_id)
+        ExportRun.objects.create(export_id=self.export_id, status="completed")
+        with CaptureQueriesContext(connection) as single:
+            self.client.get(url)
+
+        ExportRun.objects.bulk_create(
+            [ExportRun(export_id=self.export_id, status="completed") for _ in range(2)]
+        )
+        with CaptureQueriesContext(connection) as several:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(several), len(single))
+
     def test_create_run(self):
-        url = reverse("api:run_create", kwargs={"export_id": self.export_id})
+        url = _rev("api:run_create", export_id=self.export_id)
         data = {"export": self.export_id}
         response = self.client.post(url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
-    def test_get_run(self):
-        url = reverse("api:run_create", kwargs={"export_id": self.export_id})
-        data = {"export": self.export_id}
-        create_response = self.client.post(url, data, format="json")
-        run_id = create_response.data["id"]
+    def test_create_run_while_processing(self):
+        ExportRun.objects.create(export_id=self.export_id, status="queued")
+        url = _rev("api:run_create", export_id=self.export_id)
+        response = self.client.post(url, {"export": self.export_id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(ExportRun.objects.filter(export_id=self.export_id).count(), 1)
+
+    def test_create_run_for_missing_export(self):
+        missing = uuid.uuid4()
+        url = _rev("api:run_create", export_id=missing)
+        response = self.client.post(url, {"export": str(missing)}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
-        url = reverse("api:run_detail", kwargs={"pk": run_id})
+    def test_get_run(self):
+        run = ExportRun.objects.create(export_id=self.export_id)
+        url = _rev("api:run_detail", pk=run.pk)
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
     def test_start_run(self):
-        url = reverse("api:run_create", kwargs={"export_id": self.export_id})
-        data = {"export": self.export_id}
-        create_response = self.client.post(url, data, format="json")
-        run_id = create_response.data["id"]
+        run = ExportRun.objects.create(export_id=self.export_id, status="failed")
+        url = _rev("api:start_run", pk=run.pk)
+        with (
+            patch("apps.exports.tasks.process_export.huey.enqueue") as enqueue,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            response = self.client.post(url, format="json")
 
-        url = reverse("api:start_run", kwargs={"pk": run_id})
-        response = self.client.post(url, format="json")
-        self.assertIn(
-            response.status_code, [status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST]
-        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "queued")
+        enqueue.assert_called_once()
+        self.assertEqual(enqueue.call_args.args[0].id, response.data["task_id"])
 
     def test_download_run(self):
-        url = reverse("api:run_create", kwargs={"export_id": self.export_id})
-        data = {"export": self.export_id}
-        create_response = self.client.post(url, data, format="json")
-        run_id = create_response.data["id"]
+        run = ExportRun.objects.create(export_id=self.export_id)
+        url = _rev("api:download_run", pk=run.pk)
+        response = self.client.get(url)
+        # A fresh run has no output, so the view answers before touching storage.
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ExportRunFileTest(APITestCase):
+    """Tiles and download responses served from a real (temporary) MEDIA_ROOT."""
+
+    TILES = bytes(range(256)) * 4
+    OUTPUT = b'{"type": "FeatureCollection", "features": []}'
+
+    @classmethod
+    def setUpClass(cls):
+        media = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(media.cleanup)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=media.name))
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = _make_user("testuser", "test@example.com")
+        export = Export.objects.create(
+            user=cls.user,
+            name="Test Export for Files",
+            area_of_interest=NEPAL_GEOM,
+            source=["osm"],
+            output_format=["geojson"],
+        )
+        run = ExportRun(export=export, status="completed")
+        run.output_file.save("buildings.geojson", ContentFile(cls.OUTPUT), save=False)
+        run.tiles_file.save("buildings.pmtiles", ContentFile(cls.TILES), save=False)
+        run.save()
+        cls.run_id = run.pk
+        cls.output_name = run.output_file.name
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def _body(self, response):
+        try:
+            return b"".join(response.streaming_content)
+        finally:
+            response.close()
+
+    def test_tiles_range_returns_partial_content(self):
+        url = _rev("api:run_tiles", pk=self.run_id)
+        response = self.client.get(url, HTTP_RANGE="bytes=10-19")
 
-        url = reverse("api:download_run", kwargs={"pk": run_id})
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response["Content-Range"], f"bytes 10-19/{len(self.TILES)}")
+        self.assertEqual(response["Content-Length"], "10")
+        self.assertEqual(self._body(response), self.TILES[10:20])
+
+    def test_tiles_open_ended_range_reads_to_end(self):
+        url = _rev("api:run_tiles", pk=self.run_id)
+        response = self.client.get(url, HTTP_RANGE="bytes=1000-")
+
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(self._body(response), self.TILES[1000:])
+
+    def test_tiles_unsatisfiable_range(self):
+        url = _rev("api:run_tiles", pk=self.run_id)
+        response = self.client.get(url, HTTP_RANGE=f"bytes={len(self.TILES)}-")
+
+        self.assertEqual(
+            response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        )
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.TILES)}")
+
+    def test_tiles_without_range_returns_whole_file(self):
+        url = _rev("api:run_tiles", pk=self.run_id)
         response = self.client.get(url)
-        self.assertIn(
-            response.status_code,
-            [
-                status.HTTP_200_OK,
-                status.HTTP_404_NOT_FOUND,
-                status.HTTP_400_BAD_REQUEST,
-            ],
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Length"], str(len(self.TILES)))
+        self.assertEqual(self._body(response), self.TILES)
+
+    @override_settings(DOWNLOAD_ACCEL_REDIRECT_PREFIX="")
+    def test_download_streams_file_without_accel_prefix(self):
+        url = _rev("api:download_run", pk=self.run_id)
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("X-Accel-Redirect", response)
+        self.assertIn("attachment", response["Content-Disposition"])
+        self.assertEqual(self._body(response), self.OUTPUT)
+
+    @override_settings(DOWNLOAD_ACCEL_REDIRECT_PREFIX="/protected-media/", DEBUG=False)
+    def test_download_hands_off_to_proxy_with_accel_prefix(self):
+        url = _rev("api:download_run", pk=self.run_id)
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected-media/{self.output_name}"
         )
+        self.assertIn("attachment", response["Content-Disposition"])
+        self.assertEqual(response.content, b"")
+
+    @override_settings(DOWNLOAD_ACCEL_REDIRECT_PREFIX="/protected-media/", DEBUG=True)
+    def test_download_ignores_accel_prefix_in_debug(self):
+        url = _rev("api:download_run", pk=self.run_id)
+        response = self.client.get(url)
+
+        self.assertNotIn("X-Accel-Redirect", response)
+        self.assertEqual(self._body(response), self.OUTPUT)
 
 
 class PublicAPITest(APITestCase):
     def test_public_exports(self):
-        user = User.objects.create_user(
-            username="testuser", email="test@example.com", password="TestPass123!"
+        user = _make_user("testuser", "test@example.com")
+        Export.objects.create(
+            user=user,
+            name="Public Export",
+            description="Public export for testing",
+            area_of_interest=NEPAL_GEOM,
+            source=["osm"],
+            output_format=["geojson"],
+            is_public=True,
+        )
+
+        url = _rev("api:public_exports")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]["features"]), 1)
+
+
+class UtilityAPITest(APISimpleTestCase):
+    """Validation endpoints that never touch the database."""
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=User(username="testuser"))
+
+    def test_validate_aoi(self):
+        url = _rev("api:validate_aoi")
+        response = self.client.post(
+            url, VALIDATE_AOI_BODY, content_type="application/json"
         )
-        refresh = RefreshToken.for_user(user)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_validate_aoi_survives_cache_outage(self):
+        url = _rev("api:validate_aoi")
+        with patch("apps.exports.views.api_views.cache") as broken_cache:
+            broken_cache.get.side_effect = RedisError
+            broken_cache.set.side_effect = RedisError
+            response = self.client.post(
+                url, VALIDATE_AOI_BODY, content_type="application/json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["valid"])
 
-        nepal_polygon = {
+    def test_validate_aoi_subtracts_same_winding_hole(self):
+        # Both rings wound counter-clockwise: ~12,300 km² minus a ~7,900 km² hole.
+        geometry = {
+            "type": "Polygon",
+            "coordinates": [
+                [[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]],
+                [[0.1, 0.1], [0.9, 0.1], [0.9, 0.9], [0.1, 0.9], [0.1, 0.1]],
+            ],
+        }
+        url = _rev("api:validate_aoi")
+        response = self.client.post(url, {"geometry": geometry}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertAlmostEqual(response.data["area_km2"], 4431.2, delta=1)
+
+    def test_validate_aoi_strict_rejects_self_intersection(self):
+        # Closed and long enough, so only the full validity check catches it.
+        bowtie = {
             "type": "Polygon",
             "coordinates": [
                 [
-                    [83.962, 28.213],
-                    [83.962, 28.202],
-                    [83.976, 28.202],
-                    [83.976, 28.213],
-                    [83.962, 28.213],
-                ]
+                    [83.96, 28.20],
+                    [83.98, 28.21],
+                    [83.98, 28.20],
+                    [83.96, 28.21],
+                    [83.96, 28.20],
+                ],
             ],
         }
+        url = _rev("api:validate_aoi")
+        lenient = self.client.post(url, {"geometry": bowtie}, format="json")
+        strict = self.client.post(
+            f"{url}?strict=1", {"geometry": bowtie}, format="json"
+        )
+        self.assertEqual(lenient.status_code, status.HTTP_200_OK)
+        self.assertEqual(strict.status_code, status.HTTP_400_BAD_REQUEST)
 
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
-        url = reverse("api:export_list")
-        data = {
-            "name": "Public Export",
-            "description": "Public export for testing",
-            "area_of_interest": nepal_polygon,
-            "source": "osm",
-            "output_format": "geojson",
-            "is_public": True,
+    def test_validate_aoi_rejects_large_self_intersection(self):
+        # The lobes cancel to ~0 km² of signed area, but the box is ~43,000 km².
+        bowtie = {
+            "type": "Polygon",
+            "coordinates": [[[80, 27], [82, 29], [82, 27], [80, 29], [80, 27]]],
         }
-        self.client.post(url, data, format="json")
+        url = _rev("api:validate_aoi")
+        response = self.client.post(url, {"geometry": bowtie}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
-        self.client.credentials()
-        url = reverse("api:public_exports")
+    def test_source_config_schema(self):
+        url = _rev("api:source_schema", source="osm")
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["ETag"])
 
+    def test_source_config_schema_not_modified(self):
+        url = _rev("api:source_schema", source="osm")
+        etag = self.client.get(url)["ETag"]
 
-class UtilityAPITest(APITestCase):
-    def setUp(self):
-        self.user = User.objects.create_user(
-            username="testuser", email="test@example.com", password="TestPass123!"
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_unauthorized_access(self):
+        self.client.force_authenticate(user=None)
+        url = _rev("api:validate_aoi")
+        response = self.client.post(
+            url, VALIDATE_AOI_BODY, content_type="application/json"
         )
-        refresh = RefreshToken.for_user(self.user)
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
-    def test_validate_aoi(self):
-        url = reverse("api:validate_aoi")
-        data = {
-            "geometry": {
-                "type": "Polygon",
-                "coordinates": [
-                    [
-                        [83.962, 28.213],
-                        [83.962, 28.202],
-                        [83.976, 28.202],
-                        [83.976, 28.213],
-                        [83.962, 28.213],
-                    ]
-                ],
-            }
-        }
-        response = self.client.post(url, data, format="json")
+
+class HealthCheckTest(TestCase):
+    def test_liveness_skips_dependencies(self):
+        with patch("config.health.connection") as db:
+            response = self.client.get(_rev("liveness_check"))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"status": "alive"})
+        db.cursor.assert_not_called()
 
-    def test_source_config_schema(self):
-        url = reverse("api:source_schema", kwargs={"source": "osm"})
-        response = self.client.get(url)
+    def test_readiness_checks_database_and_cache(self):
+        cache.clear()
+        response = self.client.get(_rev("readiness_check"))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(), {"status": "healthy", "database": "ok", "cache": "ok"}
+        )
+
+    def test_readiness_fails_when_cache_is_down(self):
+        with patch("config.health.cache") as broken_cache:
+            broken_cache.get_or_set.side_effect = RedisError
+            response = self.client.get(_rev("readiness_check"))
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.json(), {"status": "unhealthy"})
+
+
+class LoggingConfigTest(SimpleTestCase):
+    def test_file_handler_builds_from_settings(self):
+        # Build the handler the way dictConfig does, but attach it to a private
+        # logger so the process-wide logging configuration is left untouched.
+        verbose = settings.LOGGING["formatters"]["verbose"]
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "django.log"
+            config = {**settings.LOGGING["handlers"]["file"], "filename": log_file}
+            del config["formatter"]
+            handler = logging.config.DictConfigurator({}).configure_handler(config)
+            handler.setFormatter(
+                logging.Formatter(verbose["format"], style=verbose["style"])
+            )
+            logger = logging.Logger("tests.logging")
+            logger.addHandler(handler)
+            try:
+                logger.warning("queued %s", "record")
+            finally:
+                handler.close()
+
+            self.assertIn("WARNING", log_file.read_text())
+            self.assertIn("queued record", log_file.read_text())
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    def test_matches_drf_json_renderer(self):
+        payload = {
+            "set": {1, 2},
+            "decimal": Decimal("1.10"),
+            "duration": timedelta(seconds=90),
+            "separators": "a\u2028b\u2029c",
+            "naive": datetime(2024, 1, 2, 3, 4, 5, 6000),
+            "aware": datetime(2024, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc),
+            "uuid": uuid.UUID(int=5),
+            "date": date(2024, 1, 2),
+            "int_keys": {1: "x"},
+            "unicode": "नेपाल",
+        }
+        self.assertEqual(
+            ORJSONRenderer().render(payload), JSONRenderer().render(payload)
+        )
+
+    def test_big_int_falls_back_to_drf_json_renderer(self):
+        payload = {"big": 2**70, "negative": -(2**65), "nested": [{"ok": 1}]}
+        self.assertEqual(
+            ORJSONRenderer().render(payload), JSONRenderer().render(payload)
+        )
+
+
+class ExportProcessingFlagTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.export = Export.objects.create(
+            user=_make_user("testuser", "test@example.com"),
+            name="Flag Export",
+            area_of_interest=NEPAL_GEOM,
+            source=["osm"],
+            output_format=["geojson"],
+        )
+
+    def assertFlag(self, expected):
+        self.export.refresh_from_db(fields=["is_processing_flag"])
+        self.assertIs(self.export.is_processing_flag, expected)
+
+    def test_active_run_sets_flag(self):
+        ExportRun.objects.create(export=self.export)
+        self.assertFlag(True)
+
+    def test_status_change_clears_flag(self):
+        run = ExportRun.objects.create(export=self.export, status="queued")
+        run.status = "processing"
+        run.save(update_fields=["status"])
+        self.assertFlag(True)
+
+        run.status = "completed"
+        run.save()
+        self.assertFlag(False)
+
+    def test_flag_stays_while_another_run_is_active(self):
+        ExportRun.objects.create(export=self.export, status="processing")
+        run = ExportRun.objects.create(export=self.export, status="queued")
+        run.status = "failed"
+        run.save()
+        self.assertFlag(True)
+
+    def test_delete_clears_flag(self):
+        run = ExportRun.objects.create(export=self.export)
+        run.delete()
+        self.assertFlag(False)
+
+    def test_stale_export_save_keeps_flag(self):
+        stale = Export.objects.get(pk=self.export.pk)
+        run = ExportRun.objects.create(export=self.export, status="queued")
+        stale.name = "Renamed"
+        stale.save()
+        self.assertFlag(True)
+
+        stale = Export.objects.get(pk=self.export.pk)
+        run.status = "completed"
+        run.save()
+        stale.save()
+        self.assertFlag(False)
+
+    def test_backfill_recomputes_flag(self):
+        backfill = import_module(
+            "apps.exports.migrations.0004_export_is_processing_flag"
+        ).backfill_is_processing_flag
+        idle = Export.objects.create(
+            user=self.export.user,
+            name="Idle Export",
+            area_of_interest=NEPAL_GEOM,
+            source=["osm"],
+            output_format=["geojson"],
+            is_processing_flag=True,
+        )
+        # bulk_create skips ExportRun.save(), leaving the flag stale.
+        ExportRun.objects.bulk_create([ExportRun(export=self.export)])
+        self.assertFlag(False)
+
+        backfill(django_apps, None)
+
+        self.assertFlag(True)
+        idle.refresh_from_db(fields=["is_processing_flag"])
+        self.assertIs(idle.is_processing_flag, False)